@@ -1,6 +1,10 @@
+import argparse
 import pygame
 import random
 import sys
+from collections import deque
+from collections.abc import Callable
+from typing import NamedTuple
 
 # --- Configuration ---
 GRID_WIDTH = 5  # Width of the game grid in cells
@@ -18,11 +22,34 @@ RED = (255, 0, 0)
 BLUE = (50, 153, 213)
 GRID_COLOR = (40, 40, 40)
 
+# --- Sprites ---
+# Pre-rendered once so drawing a cell is a single blit
+SEGMENT_SPRITE = pygame.Surface((CELL_SIZE, CELL_SIZE))
+SEGMENT_SPRITE.fill(GREEN)
+pygame.draw.rect(SEGMENT_SPRITE, BLACK, SEGMENT_SPRITE.get_rect(), 1)
+
+FOOD_SPRITE = pygame.Surface((CELL_SIZE, CELL_SIZE))
+FOOD_SPRITE.fill(RED)
+
+# --- Cells ---
+# Positions are packed into a single int, y * GRID_WIDTH + x, so the hot path
+# never allocates or hashes tuples. They are only decoded back to (x, y) for drawing.
+ALL_CELLS = range(GRID_WIDTH * GRID_HEIGHT)
+CELL_POS = [(x, y) for y in range(GRID_HEIGHT) for x in range(GRID_WIDTH)]
+# Screen offset and rect of every cell, so drawing never builds them per frame
+CELL_TOPLEFT = [(x * CELL_SIZE, y * CELL_SIZE) for x, y in CELL_POS]
+CELL_RECTS = [pygame.Rect(topleft, (CELL_SIZE, CELL_SIZE)) for topleft in CELL_TOPLEFT]
+
+def cell_index(pos):
+    """Packs an (x, y) position into a cell index."""
+    return pos[1] * GRID_WIDTH + pos[0]
+
 # --- Directions ---
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
+# Each direction is the cell index stride of one step
+UP = -GRID_WIDTH
+DOWN = GRID_WIDTH
+LEFT = -1
+RIGHT = 1
 
 def get_next_position_l1_traversal(current_pos, width, height):
     """
@@ -30,51 +57,89 @@ def get_next_position_l1_traversal(current_pos, width, height):
     Much simpler and more optimal than Hamiltonian cycle.
     """
     x, y = current_pos
-    
-    # If we're on an even row (0, 2, 4...), move right
-    if y % 2 == 0:
-        if x < width - 1:
-            return (x + 1, y)  # Move right
-        else:
-            # End of even row - check if we're at the bottom
-            if y >= height - 1:
-                return (0, 0)  # Wrap to start
-            else:
-                return (x, y + 1)  # Move down to next row
-    # If we're on an odd row (1, 3, 5...), move left
-    else:
-        if x > 0:
-            return (x - 1, y)  # Move left
-        else:
-            # End of odd row - check if we're at the bottom
-            if y >= height - 1:
-                return (0, 0)  # Wrap to start
-            else:
-                return (x, y + 1)  # Move down to next row
+
+    # Even rows (0, 2, 4...) run right, odd rows (1, 3, 5...) run left
+    step = 1 if y % 2 == 0 else -1
+    if 0 <= x + step < width:
+        return (x + step, y)
+    # End of the row - wrap to the start from the bottom row, otherwise move down
+    if y >= height - 1:
+        return (0, 0)
+    return (x, y + 1)
+
+# The traversal only depends on the cell, so look the next cell up instead of recomputing it
+L1_NEXT: list[int] = [cell_index(get_next_position_l1_traversal(pos, GRID_WIDTH, GRID_HEIGHT)) for pos in CELL_POS]
+
+# --- AI Strategies ---
+class AIStrategy(NamedTuple):
+    """An AI that can drive the snake."""
+    title: str  # Shown in the window caption
+    start: int  # Cell the snake starts on
+    next_cell: Callable[["Snake"], int]  # Maps the snake to the cell it moves into next
+
+def ai_l1(snake):
+    """Follows the precomputed L1 traversal from the snake's head."""
+    return L1_NEXT[snake.body[0]]
+
+AI_STRATEGIES = {
+    # The traversal starts in the top-left corner
+    "l1": AIStrategy(title="L1 Traversal", start=cell_index((0, 0)), next_cell=ai_l1),
+}
 
 class Snake:
     """Represents the snake in the game."""
-    def __init__(self):
-        self.body: list[tuple[int, int]] = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
+    def __init__(self, start_pos=cell_index((GRID_WIDTH // 2, GRID_HEIGHT // 2))):
+        self.body: deque[int] = deque([start_pos])
+        self.occ = 1 << start_pos  # Occupancy bitset, bit i set when cell i is covered
+        # Uncovered cells, plus the slot each one sits at so it can be swap-removed in O(1)
+        self.free_cells: list[int] = [cell for cell in ALL_CELLS if cell != start_pos]
+        self.free_slot: list[int] = [0] * len(ALL_CELLS)
+        for slot, cell in enumerate(self.free_cells):
+            self.free_slot[cell] = slot
         self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
         self.length = 1
 
+    def occupies(self, cell):
+        """Returns whether the snake covers the given cell."""
+        return self.occ >> cell & 1 == 1
+
     def get_head_position(self):
         """Returns the position of the snake's head."""
         return self.body[0]
 
     def turn(self, point):
         """Changes the snake's direction."""
-        if self.length > 1 and (point[0] * -1, point[1] * -1) == self.direction:
+        if self.length > 1 and -point == self.direction:
             return  # Avoids moving directly backward
         else:
             self.direction = point
 
+    def take_free_cell(self, cell):
+        """Removes a cell from free_cells by moving the last free cell into its slot."""
+        last = self.free_cells.pop()
+        if last != cell:
+            slot = self.free_slot[cell]
+            self.free_cells[slot] = last
+            self.free_slot[last] = slot
+
+    def release_cell(self, cell):
+        """Adds a cell back to free_cells."""
+        self.free_slot[cell] = len(self.free_cells)
+        self.free_cells.append(cell)
+
     def move(self, next_pos):
-        """Moves the snake one step forward."""
-        self.body.insert(0, next_pos)
-        if len(self.body) > self.length:
-            self.body.pop()
+        """Moves the snake one step forward and returns the cell the tail left, if any."""
+        # Pop the tail first so the head can move into the cell the tail is leaving
+        tail = None
+        if len(self.body) >= self.length:
+            tail = self.body.pop()
+            self.occ &= ~(1 << tail)
+            self.release_cell(tail)
+        if not self.occupies(next_pos):
+            self.take_free_cell(next_pos)
+        self.occ |= 1 << next_pos
+        self.body.appendleft(next_pos)
+        return None if tail == next_pos else tail
 
     def grow(self):
         """Increases the snake's length by one."""
@@ -82,28 +147,36 @@ class Snake:
 
     def draw(self, surface):
         """Draws the snake on the screen."""
-        for segment in self.body:
-            r = pygame.Rect((segment[0] * CELL_SIZE, segment[1] * CELL_SIZE), (CELL_SIZE, CELL_SIZE))
-            pygame.draw.rect(surface, GREEN, r)
-            pygame.draw.rect(surface, BLACK, r, 1)
+        surface.blits([(SEGMENT_SPRITE, CELL_TOPLEFT[i]) for i in self.body], doreturn=False)
 
 class Food:
     """Represents the food in the game."""
-    def __init__(self):
-        self.position = (0, 0)
-        self.randomize_position()
+    def __init__(self, free_cells=ALL_CELLS):
+        self.position = 0
+        self.randomize_position(free_cells)
 
-    def randomize_position(self, snake_body=[]):
-        """Places the food at a random position on the grid, not on the snake."""
-        while True:
-            self.position = (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
-            if self.position not in snake_body:
-                break
+    def randomize_position(self, free_cells):
+        """Places the food on a random cell not covered by the snake."""
+        self.position = free_cells[random.randrange(len(free_cells))]
 
     def draw(self, surface):
         """Draws the food on the screen."""
-        r = pygame.Rect((self.position[0] * CELL_SIZE, self.position[1] * CELL_SIZE), (CELL_SIZE, CELL_SIZE))
-        pygame.draw.rect(surface, RED, r)
+        surface.blit(FOOD_SPRITE, CELL_TOPLEFT[self.position])
+
+def tick(snake: Snake, food: Food, ai: Callable[[Snake], int]) -> tuple[int | None, bool]:
+    """
+    Advances the game logic by one step: AI move, food collision and growth.
+    Updates the snake and food in place and returns the cell the tail vacated
+    (or None) and whether food was eaten. Rendering is left to the caller.
+    """
+    vacated = snake.move(ai(snake))
+    ate = snake.body[0] == food.position
+    if ate:
+        snake.grow()
+        # Once the snake fills the board there is nowhere left to put the food
+        if snake.length < GRID_WIDTH * GRID_HEIGHT:
+            food.randomize_position(snake.free_cells)
+    return vacated, ate
 
 def draw_grid(surface):
     """Draws the grid lines on the screen."""
@@ -112,70 +185,112 @@ def draw_grid(surface):
             rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
             pygame.draw.rect(surface, GRID_COLOR, rect, 1)
 
-def main():
-    """Main function to run the game."""
+def cells_under(rect):
+    """Returns the grid cells overlapped by a screen rect."""
+    x_cells = range(rect.left // CELL_SIZE, min((rect.right - 1) // CELL_SIZE + 1, GRID_WIDTH))
+    y_cells = range(rect.top // CELL_SIZE, min((rect.bottom - 1) // CELL_SIZE + 1, GRID_HEIGHT))
+    return {y * GRID_WIDTH + x for y in y_cells for x in x_cells}
+
+def draw_cells(surface, background, cells, snake, food):
+    """Repaints only the given cells and returns their screen rects."""
+    rects = []
+    for cell in cells:
+        rect = CELL_RECTS[cell]
+        surface.blit(background, rect, rect)
+        if cell == food.position:
+            surface.blit(FOOD_SPRITE, rect)
+        elif snake.occupies(cell):
+            surface.blit(SEGMENT_SPRITE, rect)
+        rects.append(rect)
+    return rects
+
+def draw_frame(surface, background, snake, food, score_surface):
+    """Draws the whole board, snake, food and score."""
+    surface.blit(background, (0, 0))
+    snake.draw(surface)
+    food.draw(surface)
+    surface.blit(score_surface, (10, 10))
+
+def main(ai_name="l1"):
+    """Main function to run the game with the named AI strategy."""
+    strategy = AI_STRATEGIES[ai_name]
     pygame.init()
+    # The game only reacts to QUIT and window exposure, so don't queue anything else
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed([pygame.QUIT, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED])
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("Snake AI - L1 Traversal")
+    pygame.display.set_caption(f"Snake AI - {strategy.title}")
     clock = pygame.time.Clock()
 
-    snake = Snake()
-    
-    # Start the snake at position (0,0) for L1 traversal
-    start_pos: tuple[int, int] = (0, 0)
-    snake.body = [start_pos]
+    # The grid never changes, so draw it once and blit it every frame
+    grid_bg = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    grid_bg.fill(BLACK)
+    draw_grid(grid_bg)
 
-    food = Food()
-    food.randomize_position(snake.body)
+    snake = Snake(strategy.start)
+
+    food = Food(snake.free_cells)
     
     score = 0
     font = pygame.font.Font(None, 36)
+    # Only re-render the score text when the score actually changes
+    score_surface = font.render(f"Score: {score}", True, WHITE)
+    score_rect = score_surface.get_rect(topleft=(10, 10))
+    score_cells = cells_under(score_rect)
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+    # Draw the first frame in full; after that only the cells that change are repainted
+    draw_frame(screen, grid_bg, snake, food, score_surface)
+    pygame.display.update()
 
-        # --- AI Logic - Simple L1 Traversal ---
-        current_pos = snake.get_head_position()
-        next_pos = get_next_position_l1_traversal(current_pos, GRID_WIDTH, GRID_HEIGHT)
+    while True:
+        if pygame.event.peek(pygame.QUIT):
+            pygame.quit()
+            sys.exit()
+        # Only changed cells are repainted, so a window that was covered needs a full redraw
+        if pygame.event.get([pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED]):
+            draw_frame(screen, grid_bg, snake, food, score_surface)
+            pygame.display.update()
 
-        snake.move(next_pos)
+        # --- AI Logic ---
+        vacated, ate = tick(snake, food, strategy.next_cell)
+        dirty_cells = {snake.get_head_position()}
+        if vacated is not None:
+            dirty_cells.add(vacated)
         
-        # Check for collision with food
-        if snake.get_head_position() == food.position:
-            snake.grow()
+        if ate:
             score += 1
+            score_surface = font.render(f"Score: {score}", True, WHITE)
+            # Clear the old text as well, since the new one can be narrower
+            dirty_cells |= score_cells
+            score_rect = score_surface.get_rect(topleft=(10, 10))
+            score_cells = cells_under(score_rect)
             # If the snake fills the whole screen, we've won.
             if snake.length == GRID_WIDTH * GRID_HEIGHT:
                 print("Game Won! The snake has filled the board.")
                 # Drawing everything one last time to show the full snake
-                screen.fill(BLACK)
-                draw_grid(screen)
-                snake.draw(screen)
-                food.draw(screen)
-                score_text = font.render(f"Score: {score}", True, WHITE)
-                screen.blit(score_text, (10, 10))
-                pygame.display.flip()
+                draw_frame(screen, grid_bg, snake, food, score_surface)
+                pygame.display.update()
                 pygame.time.wait(3000)
                 pygame.quit()
                 sys.exit()
             
-            food.randomize_position(snake.body)
+            dirty_cells.add(food.position)
 
-        # Drawing everything
-        screen.fill(BLACK)
-        draw_grid(screen)
-        snake.draw(screen)
-        food.draw(screen)
-        
-        # Display Score
-        score_text = font.render(f"Score: {score}", True, WHITE)
-        screen.blit(score_text, (10, 10))
+        # The score is drawn over the grid, so repaint everything under it whenever
+        # it changes or a cell beneath it does, then put the text back on top
+        redraw_score = ate or not dirty_cells.isdisjoint(score_cells)
+        if redraw_score:
+            dirty_cells |= score_cells
+
+        dirty_rects = draw_cells(screen, grid_bg, dirty_cells, snake, food)
+        if redraw_score:
+            screen.blit(score_surface, (10, 10))
+            dirty_rects.append(score_rect)
 
-        pygame.display.flip()
+        pygame.display.update(dirty_rects)
         clock.tick(GAME_SPEED)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Watch an AI play snake.")
+    parser.add_argument("--ai", choices=AI_STRATEGIES, default="l1", help="strategy that steers the snake")
+    main(parser.parse_args().ai)